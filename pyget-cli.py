@@ -26,19 +26,62 @@ Usage:
 """
 
 import os
+import socket
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import itertools
+import math
+import queue
+import struct
 import threading
 import time
-import json
 from urllib.parse import urlsplit
 
+# One progress record: split index + bytes downloaded for that split.
+PROGRESS_RECORD = struct.Struct('<IQ')
+
+# (connect, read) timeouts so a stalled server cannot hang a worker forever.
+REQUEST_TIMEOUT = (5, 30)
+
+# How much to pull off the socket per read. Kept small so stop/pause are
+# checked within milliseconds even when chunk_size is several MB.
+NETWORK_READ_SIZE = 128 * 1024
+
+# Adaptive concurrency ramp: start this many splits at once, then add one
+# every RAMP_INTERVAL seconds while aggregate throughput keeps growing.
+INITIAL_CONCURRENCY = 4
+RAMP_INTERVAL = 2.0
+RAMP_GROWTH_FACTOR = 1.05
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Nagle batches small writes and interacts badly with delayed ACKs, which can
+# stall the trailing bytes of a range by ~40 ms; keep-alive catches dead
+# connections behind NATs during long downloads.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+class TunedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        return super().proxy_manager_for(*args, **kwargs)
+
 def human_readable_size(size, decimal_places=2):
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024:
-            return f"{size:.{decimal_places}f} {unit}"
-        size /= 1024
+    # The reporter calls this several times a second; pick the unit with one
+    # log2 instead of looping through divisions.
+    if size <= 0:
+        return f"{0:.{decimal_places}f} B"
+    exp = min(int(math.log2(size) / 10), len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * exp)):.{decimal_places}f} {_SIZE_UNITS[exp]}"
 
 def human_readable_time(seconds):
     minutes, seconds = divmod(seconds, 60)
@@ -57,18 +100,45 @@ class Downloader:
         self.num_splits = num_splits
         self.chunk_size = chunk_size
         self.total_size = 0
-        self.downloaded = 0
+        self.ranges_supported = True
         self.split_sizes = []
-        self.parts = []
-        self.part_progress = {}
+        self.part_progress = []
         self.start_time = None
         self.stop_event = threading.Event()
-        self.pause_event = threading.Event()
+        # Set means "running"; clear it to pause, set it again to resume.
+        self.resume_event = threading.Event()
+        self.resume_event.set()
         self.progress_file = f"{self.filename}.progress"
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+        self.save_interval = 1.0  # seconds between progress saves
+        self._progress_fd = None
+        self._last_save_ts = []
+
+    def configure_session(self):
+        # More threads than this just pile up idle sockets; splits beyond the
+        # cap wait their turn in the executor queue.
+        self.max_workers = min(self.num_splits,
+                               int(os.environ.get('PYGET_MAX_WORKERS', 8)))
+        # Share one connection pool across all split threads so each worker
+        # reuses a warm socket instead of paying a TCP+TLS handshake.
+        adapter = TunedHTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def get_total_size(self):
-        response = requests.head(self.url)
+        if self.total_size:  # already probed; don't repeat the HEAD request
+            return self.total_size
+        response = self.session.head(self.url, timeout=REQUEST_TIMEOUT)
         self.total_size = int(response.headers.get('content-length', 0))
+        # If the server does not advertise byte ranges, splitting would make
+        # every worker re-download the whole file.
+        self.ranges_supported = 'bytes' in response.headers.get('Accept-Ranges', '').lower()
         return self.total_size
 
     def determine_optimal_settings(self):
@@ -84,66 +154,272 @@ class Downloader:
         self.chunk_size = min(4 * 1024 * 1024, total_size // self.num_splits)  # Max 4 MB chunks or equal chunks based on splits
 
     def load_progress(self):
+        # A plain list indexed by split: no hashing or key objects on the
+        # per-flush update path, and summing it is a straight C loop.
+        self.part_progress = [0] * self.num_splits
         if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                self.part_progress = json.load(f)
-            # Ensure all splits are accounted for in progress
-            for i in range(self.num_splits):
-                if str(i) not in self.part_progress:
-                    self.part_progress[str(i)] = 0
-        else:
-            self.part_progress = {str(i): 0 for i in range(self.num_splits)}
-
-    def save_progress(self):
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.part_progress, f)
-
-    def download_split(self, start, end, part_file, split_index):
-        current_start = start + self.part_progress[str(split_index)]
+            with open(self.progress_file, 'rb') as f:
+                data = f.read()
+            # Replay the log; the last record per split wins.
+            for split_index, bytes_done in PROGRESS_RECORD.iter_unpack(
+                    data[:len(data) - len(data) % PROGRESS_RECORD.size]):
+                if split_index < self.num_splits:
+                    self.part_progress[split_index] = bytes_done
+            # Compact the replayed log so it does not grow across resumes.
+            with open(self.progress_file, 'wb') as f:
+                for i in range(self.num_splits):
+                    f.write(PROGRESS_RECORD.pack(i, self.part_progress[i]))
+        self._progress_fd = os.open(self.progress_file,
+                                    os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._last_save_ts = [0.0] * self.num_splits
+
+    def save_progress(self, split_index):
+        # A single O_APPEND write of a fixed-size record is atomic, so the
+        # worker threads can append concurrently without a lock.
+        os.write(self._progress_fd,
+                 PROGRESS_RECORD.pack(split_index, self.part_progress[split_index]))
+
+    def bytes_downloaded(self):
+        # Each split only writes its own entry, so summing here needs no lock
+        # and the hot path never touches a shared counter.
+        return sum(self.part_progress)
+
+    def close_progress(self):
+        if self._progress_fd is not None:
+            os.close(self._progress_fd)
+            self._progress_fd = None
+
+    def download_split(self, out_fd, start, end, split_index):
+        current_start = start + self.part_progress[split_index]
         if current_start >= end:
             return  # This part is already complete
 
         headers = {'Range': f'bytes={current_start}-{end}'}
-        response = requests.get(self.url, headers=headers, stream=True)
+        response = self.session.get(self.url, headers=headers, stream=True,
+                                    timeout=REQUEST_TIMEOUT)
+        # An error body must not be mistaken for EOF: without this a 500 on
+        # one split "completes" instantly and leaves a zero-filled hole in
+        # the output while the run still reports success.
+        response.raise_for_status()
+        if response.status_code != 206 and current_start:
+            # The server ignored the Range header; writing the whole file's
+            # bytes at this split's offset would corrupt the output.
+            raise requests.HTTPError(
+                f"server ignored Range request at offset {current_start}",
+                response=response)
+
+        # Pipeline the split: this thread reads the network into a small
+        # bounded queue, a writer thread drains it to disk. On slow storage
+        # the socket keeps filling while a write is in flight; the queue
+        # bound keeps the buffered data per split to ~512 KB.
+        work_queue = queue.Queue(maxsize=4)
+        writer_error = []
 
-        with open(part_file, 'ab') as f:
-            for data in response.iter_content(chunk_size=self.chunk_size):
-                if self.stop_event.is_set():
+        def write_chunks():
+            progress = self.part_progress
+            last_save = self._last_save_ts
+            offset = current_start
+            # Coalesce the 128 KB network chunks into chunk_size batches and
+            # submit each batch as one pwritev; this cuts the write syscall
+            # count by ~8x without copying the buffers.
+            flush_threshold = self.chunk_size or (1 << 20)
+            use_pwritev = hasattr(os, 'pwritev')
+            pending = []
+            pending_bytes = 0
+
+            def flush():
+                nonlocal offset, pending_bytes
+                if not pending:
                     return
-                while self.pause_event.is_set():
-                    self.pause_event.wait()
-                f.write(data)
-                self.part_progress[str(split_index)] += len(data)
-                self.save_progress()
-                self.downloaded += len(data)
-                print(f"Downloading part {split_index + 1}/{self.num_splits}: {self.part_progress[str(split_index)] / (end - start + 1) * 100:.2f}%")
-
-    def merge_files(self):
-        with open(self.filename, 'wb') as outfile:
-            for part_file in self.parts:
-                with open(part_file, 'rb') as infile:
-                    outfile.write(infile.read())
-                os.remove(part_file)
+                if use_pwritev:
+                    os.pwritev(out_fd, pending, offset)
+                else:
+                    os.pwrite(out_fd, b''.join(pending), offset)
+                offset += pending_bytes
+                progress[split_index] += pending_bytes
+                pending.clear()
+                pending_bytes = 0
+                # Appending a progress record for every flush swamps the
+                # disk with metadata writes; once a second is plenty.
+                now = time.monotonic()
+                if now - last_save[split_index] > self.save_interval:
+                    last_save[split_index] = now
+                    self.save_progress(split_index)
+
+            try:
+                while True:
+                    data = work_queue.get()
+                    if data is None:
+                        flush()
+                        break
+                    pending.append(data)
+                    pending_bytes += len(data)
+                    if pending_bytes >= flush_threshold:
+                        flush()
+            except Exception as exc:
+                writer_error.append(exc)
+
+        writer = threading.Thread(target=write_chunks)
+        writer.start()
+
+        # Hoist attribute lookups out of the per-chunk loop; these run for
+        # every chunk on every thread and the bindings never change.
+        stop_is_set = self.stop_event.is_set
+        wait_if_paused = self.resume_event.wait
+        # Read the urllib3 response directly; iter_content adds a generator
+        # frame and chunk bookkeeping per read that we do not need.
+        response.raw.decode_content = True
+        read = response.raw.read
+
+        try:
+            while not writer_error:
+                data = read(NETWORK_READ_SIZE)
+                if not data or stop_is_set():
+                    break
+                wait_if_paused()
+                # Never block on the queue unconditionally: if the writer
+                # died on a full queue nothing drains it, so keep rechecking
+                # writer_error instead of hanging in put().
+                while not writer_error:
+                    try:
+                        work_queue.put(data, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+        finally:
+            # Post the sentinel without risking a permanent block: only a
+            # dead writer leaves the queue full forever, so drain stale
+            # chunks solely in that case. A live writer must keep every
+            # queued chunk — it writes a gapless stream from its offset, so
+            # stealing one would shift all later writes and corrupt the file.
+            while True:
+                try:
+                    work_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    if writer_error or not writer.is_alive():
+                        try:
+                            work_queue.get_nowait()
+                        except queue.Empty:
+                            pass
+            writer.join()
+            self.save_progress(split_index)
+            if writer_error:
+                raise writer_error[0]
+
+    def preallocate_output(self):
+        # Reserve the final file up front so every split can write straight
+        # to its own byte range; no .partN files and no merge pass.
+        fd = os.open(self.filename, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, self.total_size)
+            else:
+                os.ftruncate(fd, self.total_size)
+        except OSError:
+            os.ftruncate(fd, self.total_size)
+        return fd
+
+    def report_progress(self, done_event):
+        # Printing from every worker for every chunk serializes the threads
+        # on the stdout lock; one reporter at ~10 Hz is enough for a console.
+        session_start = self.bytes_downloaded()  # bytes carried over from a resume
+        while not done_event.wait(0.1):
+            if self.total_size and self.resume_event.is_set():
+                downloaded = self.bytes_downloaded()
+                elapsed = time.time() - self.start_time
+                speed = (downloaded - session_start) / elapsed if elapsed > 0 else 0
+                print(f"Downloading: {downloaded / self.total_size * 100:.1f}% "
+                      f"({human_readable_size(speed)}/s)", end='\r', flush=True)
+
+    def run_splits(self, executor, out_fd):
+        # Ramp concurrency from measured throughput instead of launching every
+        # split at once: start a few, add one per interval while the aggregate
+        # rate keeps growing, and hold steady once it plateaus. Every split
+        # still runs; plateauing only stops raising the active count.
+        pending = deque(enumerate(self.split_sizes))
+        active = {}
+
+        def submit_next():
+            i, (start, end) = pending.popleft()
+            active[executor.submit(self.download_split, out_fd, start, end, i)] = i
+
+        for _ in range(min(INITIAL_CONCURRENCY, len(pending))):
+            submit_next()
+
+        target = len(active)
+        ramping = bool(pending)
+        prev_rate = 0.0
+        prev_bytes = self.bytes_downloaded()
+        prev_ts = time.monotonic()
+
+        while active:
+            done, _ = wait(active, timeout=RAMP_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                del active[future]
+                try:
+                    future.result()
+                except Exception:
+                    # One failed split means the file cannot complete; stop
+                    # the others now instead of letting them burn bandwidth.
+                    self.stop_event.set()
+                    for other in active:
+                        other.cancel()
+                    raise
+            while pending and len(active) < target:
+                submit_next()
+
+            if ramping and pending:
+                now = time.monotonic()
+                if now - prev_ts >= RAMP_INTERVAL:
+                    downloaded = self.bytes_downloaded()
+                    rate = (downloaded - prev_bytes) / (now - prev_ts)
+                    if prev_rate == 0.0 or rate > prev_rate * RAMP_GROWTH_FACTOR:
+                        target += 1
+                        submit_next()
+                    else:
+                        ramping = False
+                    prev_rate = rate
+                    prev_bytes = downloaded
+                    prev_ts = now
 
     def download(self):
+        if not self.ranges_supported and self.num_splits != 1:
+            print("Server does not accept range requests; downloading in a single stream")
+            self.num_splits = 1
+        self.configure_session()
         self.load_progress()
         self.start_time = time.time()
-        split_size = self.total_size // self.num_splits
+        # Spread the remainder over the first splits so every range is within
+        # one byte of equal; a truncating split_size made the last worker the
+        # straggler on every download.
+        base, rem = divmod(self.total_size, self.num_splits)
+        sizes = [base + (1 if i < rem else 0) for i in range(self.num_splits)]
+        offsets = list(itertools.accumulate(sizes, initial=0))
+        self.split_sizes = [(offsets[i], offsets[i + 1] - 1) for i in range(self.num_splits)]
 
-        self.parts = [f"{self.filename}.part{i}" for i in range(self.num_splits)]
-        self.split_sizes = [(i * split_size, (i + 1) * split_size - 1 if i < self.num_splits - 1 else self.total_size - 1) for i in range(self.num_splits)]
+        done_event = threading.Event()
+        reporter = threading.Thread(target=self.report_progress, args=(done_event,), daemon=True)
+        reporter.start()
 
-        with ThreadPoolExecutor(max_workers=self.num_splits) as executor:
-            futures = []
-            for i, (start, end) in enumerate(self.split_sizes):
-                part_file = self.parts[i]
-                futures.append(executor.submit(self.download_split, start, end, part_file, i))
+        out_fd = self.preallocate_output()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                self.run_splits(executor, out_fd)
+        finally:
+            if hasattr(os, 'posix_fadvise'):
+                # We never read the file back, so tell the kernel it can
+                # evict these pages instead of squeezing other processes'
+                # caches. Best effort: dirty pages drop after writeback.
+                os.posix_fadvise(out_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            os.close(out_fd)
+            done_event.set()
+            reporter.join()
+            print()
 
-            for future in as_completed(futures):
-                future.result()
+        self.close_progress()
 
         if not self.stop_event.is_set():
-            self.merge_files()
             print("Download Complete")
             if os.path.exists(self.progress_file):
                 os.remove(self.progress_file)
@@ -12,7 +12,7 @@ Dependencies:
 - tkinter
 - threading
 - concurrent.futures
-- json
+- array
 - time
 - os
 - urllib.parse
@@ -25,23 +25,60 @@ Usage:
 5. Click "Download" to start the download process.
 """
 
+import array
+import mmap
 import os
+import socket
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import time
-import json
 from urllib.parse import urlsplit
-import yt_dlp
 import re
 
+# Below this size, one multipart/byteranges request beats opening
+# num_splits parallel connections whose handshakes dominate the transfer.
+MULTIRANGE_THRESHOLD = 100 * 1024 * 1024
+
+# Hard ceiling on parallel range requests. Past this, extra sockets mostly
+# add kernel contention and risk file-handle exhaustion, not throughput.
+MAX_SPLITS = 16
+
+_CONTENT_RANGE = re.compile(rb'content-range:\s*bytes\s+(\d+)-(\d+)', re.IGNORECASE)
+
+# Socket read buffer per split. Independent of the user-facing chunk size:
+# a 1 MB readinto drains the kernel buffer in one syscall on fast links.
+READ_BUFFER_SIZE = 1 << 20
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Disable Nagle on download sockets — the delayed-ACK interaction can hold
+# back the last partial TLS record of a range for ~40 ms — and turn on TCP
+# keep-alive so idle pooled connections behind NATs don't die silently.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+class TunedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        return super().proxy_manager_for(*args, **kwargs)
+
 def human_readable_size(size, decimal_places=2):
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024:
-            return f"{size:.{decimal_places}f} {unit}"
-        size /= 1024
+    # Called for every label refresh; pick the unit straight from the bit
+    # length instead of looping through up to five float divisions.
+    if size <= 0:
+        return f"{0:.{decimal_places}f} B"
+    shift = min(max((int(size).bit_length() - 1) // 10, 0), len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (shift * 10)):.{decimal_places}f} {_SIZE_UNITS[shift]}"
 
 def human_readable_time(seconds):
     minutes, seconds = divmod(seconds, 60)
@@ -57,8 +94,12 @@ def human_readable_speed(speed):
     mbps = (speed * 8) / (1024 * 1024)  # Convert bytes/s to Mbps
     return f"{mbps:.2f} Mbps"
 
+# str.translate with a precomputed table is a C-level lookup per char,
+# several times faster than running the regex engine for each filename.
+_FILENAME_BAD = str.maketrans('', '', '<>:"/\\|?*')
+
 def sanitize_filename(filename):
-    return re.sub(r'[<>:"/\\|?*]', '', filename)
+    return filename.translate(_FILENAME_BAD)
 
 def extract_file_extension(url):
     path = urlsplit(url).path
@@ -66,26 +107,46 @@ def extract_file_extension(url):
     return ext or ".bin"
 
 class Downloader:
+    # yt_dlp pulls in hundreds of modules and adds several hundred ms to
+    # startup, so it is imported on first YouTube URL and cached here.
+    _ydl_cls = None
+
     def __init__(self, url, num_splits=8, chunk_size=1024*1024):
         self.url = url
         self.num_splits = num_splits
         self.chunk_size = chunk_size
         self.total_size = 0
-        self.downloaded = 0
+        self.ranges_supported = True
         self.split_sizes = []
-        self.parts = []
-        self.part_progress = {}
+        self._progress_counts = array.array('Q')
+        self._progress_fd = None
         self.start_time = None
         self.stop_event = threading.Event()
-        self.pause_event = threading.Event()
+        # Set means "running"; clear it to pause, set it again to resume.
+        self.resume_event = threading.Event()
+        self.resume_event.set()
         self.progress_file = None
         self.download_url = None
         self.filename = None
+        # One pooled session shared by the HEAD probe and all range GETs, so
+        # each split reuses a warm socket instead of a fresh TCP+TLS handshake.
+        self.session = requests.Session()
+        retries = Retry(total=5, backoff_factor=0.3,
+                        status_forcelist=[502, 503, 504])
+        # Pool sized to the split ceiling so every worker can hold a warm
+        # socket even when determine_optimal_settings raises num_splits later.
+        adapter = TunedHTTPAdapter(pool_connections=MAX_SPLITS, pool_maxsize=MAX_SPLITS,
+                                   max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def get_download_info(self):
         if "youtube.com" in self.url or "youtu.be" in self.url:
+            if Downloader._ydl_cls is None:
+                import yt_dlp
+                Downloader._ydl_cls = yt_dlp.YoutubeDL
             ydl_opts = {'format': 'best'}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with Downloader._ydl_cls(ydl_opts) as ydl:
                 info_dict = ydl.extract_info(self.url, download=False)
                 self.download_url = info_dict.get('url', self.url)  # Use URL directly if no download URL is found
                 self.filename = sanitize_filename(info_dict.get('title', 'download')) + ".mp4"
@@ -96,7 +157,11 @@ class Downloader:
             filename = os.path.basename(path) or 'download'
             self.filename = sanitize_filename(filename) + file_extension
         self.progress_file = f"{self.filename}.progress"
-        self.total_size = int(requests.head(self.download_url).headers.get('Content-Length', 0))
+        head = self.session.head(self.download_url, allow_redirects=True)
+        self.total_size = int(head.headers.get('Content-Length', 0))
+        # Without advertised range support, splitting would make every
+        # worker download the full file.
+        self.ranges_supported = 'bytes' in head.headers.get('Accept-Ranges', '').lower()
         return self.download_url, self.filename
 
     def update_progress_file(self):
@@ -104,90 +169,233 @@ class Downloader:
 
     def determine_optimal_settings(self):
         total_size = self.total_size
-        if total_size < 100 * 1024 * 1024:  # Less than 100 MB
-            self.num_splits = 4
-        elif total_size < 1 * 1024 * 1024 * 1024:  # Less than 1 GB
-            self.num_splits = 8
-        else:  # 1 GB and above
-            self.num_splits = 16
-        self.chunk_size = min(4 * 1024 * 1024, total_size // self.num_splits)  # Max 4 MB chunks or equal chunks based on splits
+        # One split per 64 MB, at least 4, capped at MAX_SPLITS where
+        # concurrent range requests against a single origin stop paying
+        # off. PYGET_WORKERS lowers the cap for constrained environments.
+        cap = min(int(os.environ.get('PYGET_WORKERS', MAX_SPLITS)), MAX_SPLITS)
+        self.num_splits = min(cap, max(4, total_size // (64 * 1024 * 1024)))
+        # Size chunks from the kernel's socket receive buffer (2x, page
+        # aligned) so each read can drain it in one go, instead of a fixed
+        # 4 MB that just sits in userspace on slower links.
+        probe = socket.socket()
+        rcvbuf = probe.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        probe.close()
+        page = mmap.PAGESIZE
+        target = max(64 * 1024, min(4 * 1024 * 1024, rcvbuf * 2))
+        target = ((target + page - 1) // page) * page
+        self.chunk_size = min(target, total_size // self.num_splits) or target
 
     def load_progress(self):
+        # Live counters for the workers: one slot per split, one writer each,
+        # so the hot loop needs no lock and no dict/str machinery. On disk the
+        # file is just those slots dumped back to back (num_splits x uint64);
+        # anything else (old JSON format, torn write) means start from zero.
+        counts = array.array('Q', bytes(8 * self.num_splits))
         if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                self.part_progress = json.load(f)
-            for i in range(self.num_splits):
-                if str(i) not in self.part_progress:
-                    self.part_progress[str(i)] = 0
-        else:
-            self.part_progress = {str(i): 0 for i in range(self.num_splits)}
+            with open(self.progress_file, 'rb') as f:
+                data = f.read()
+            if len(data) == 8 * self.num_splits:
+                counts = array.array('Q')
+                counts.frombytes(data)
+        self._progress_counts = counts
 
     def save_progress(self):
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.part_progress, f)
-
-    def download_split(self, start, end, part_file, split_index, progress_callback=None, status_callback=None, time_callback=None, speed_callback=None):
-        current_start = start + self.part_progress[str(split_index)]
+        # One pwrite of the fixed-size record at offset 0: the file never
+        # changes length, so there is nothing to truncate or swap, and at
+        # 128 bytes for 16 splits the write lands in a single syscall.
+        if self._progress_fd is None:
+            self._progress_fd = os.open(self.progress_file,
+                                        os.O_WRONLY | os.O_CREAT, 0o644)
+        os.pwrite(self._progress_fd, self._progress_counts.tobytes(), 0)
+
+    def _progress_flusher(self, done_event):
+        # One thread persists progress at 1 Hz; the download threads only
+        # bump in-memory counters.
+        while not done_event.wait(1.0):
+            self.save_progress()
+        self.save_progress()
+
+    def progress_snapshot(self):
+        # For the GUI poller: each slot has a single writer, so reading a
+        # copy from the main thread is safe without a lock.
+        return list(self._progress_counts)
+
+    def download_split(self, out_fd, start, end, split_index):
+        current_start = start + self._progress_counts[split_index]
         if current_start >= end:
             return
         headers = {'Range': f'bytes={current_start}-{end}'}
-        response = requests.get(self.download_url, headers=headers, stream=True)
-        bytes_downloaded = 0
-        start_time = time.time()  # Local start time for this split
-        with open(part_file, 'ab') as f:
-            for data in response.iter_content(chunk_size=self.chunk_size):
-                if self.stop_event.is_set():
-                    return
-                while self.pause_event.is_set():
-                    self.pause_event.wait()
-                f.write(data)
-                bytes_downloaded += len(data)
-                self.part_progress[str(split_index)] += len(data)
-                self.save_progress()
-                if progress_callback:
-                    self.downloaded += len(data)
-                    progress_callback(split_index, len(data), end - start + 1)
-                if status_callback:
-                    status_callback(f"Downloading part {split_index + 1}/{self.num_splits}: {self.part_progress[str(split_index)] / (end - start + 1) * 100:.2f}%")
-                if time_callback:
-                    elapsed_time = time.time() - self.start_time
-                    if self.downloaded > 0:
-                        estimated_total_time = (self.total_size / self.downloaded) * elapsed_time
-                        remaining_time = estimated_total_time - elapsed_time
-                        time_callback(remaining_time)
-                if speed_callback:
-                    elapsed_time = time.time() - start_time
-                    if elapsed_time > 0:
-                        speed_callback(bytes_downloaded / elapsed_time)
-
-    def merge_files(self):
-        with open(self.filename, 'wb') as outfile:
-            for part_file in self.parts:
-                if os.path.exists(part_file):
-                    with open(part_file, 'rb') as infile:
-                        outfile.write(infile.read())
-                    os.remove(part_file)
-
-    def download(self, progress_callback=None, status_callback=None, time_callback=None, speed_callback=None):
+        response = self.session.get(self.download_url, headers=headers, stream=True)
+        # An error body reads as instant EOF, which would mark the split
+        # complete and leave a zero-filled hole in the file; raise so the
+        # failure reaches download() and the GUI reports it.
+        response.raise_for_status()
+        if response.status_code != 206 and current_start:
+            response.close()
+            # Writing a from-the-start body at this offset would corrupt
+            # the file; the server ignored the Range header.
+            raise requests.HTTPError(
+                f"server ignored Range request at offset {current_start}",
+                response=response)
+        try:
+            offset = current_start
+            # Read into one reusable buffer instead of letting iter_content
+            # allocate a fresh bytes object per chunk. The loop only moves bytes
+            # and bumps this split's counter; all formatting, speed and ETA work
+            # happens in the GUI poller at its own pace.
+            response.raw.decode_content = False
+            buf = bytearray(READ_BUFFER_SIZE)
+            view = memoryview(buf)
+            # Bind the loop's lookups to locals once; they run for every chunk
+            # on every thread and never change.
+            readinto = response.raw.readinto
+            counts = self._progress_counts
+            stop_is_set = self.stop_event.is_set
+            wait_if_paused = self.resume_event.wait
+            pwrite = os.pwrite
+            # Event.is_set takes a lock; downloads almost never stop, so checking
+            # every 16th chunk is plenty responsive and keeps two lock
+            # acquisitions per chunk out of the hot path.
+            tick = 0
+            while True:
+                n = readinto(view)
+                if not n:
+                    break
+                tick += 1
+                if tick & 15 == 0:
+                    if stop_is_set():
+                        return
+                    # Free while running (the event stays set); blocks only
+                    # for the duration of a pause.
+                    wait_if_paused()
+                pwrite(out_fd, view[:n], offset)
+                offset += n
+                counts[split_index] += n
+        finally:
+            # Return the socket to the keep-alive pool right away instead of
+            # leaking it until the garbage collector notices.
+            response.close()
+
+    def download_multirange(self, out_fd):
+        # Fetch every unfinished split with one comma-separated Range header:
+        # a single TCP/TLS handshake and the server coalesces the reads.
+        # Returns True when everything was written, False when the server
+        # did not answer with multipart/byteranges (caller falls back to
+        # parallel range GETs).
+        ranges = []
+        for i, (start, end) in enumerate(self.split_sizes):
+            current = start + self._progress_counts[i]
+            if current <= end:
+                ranges.append((current, end, i))
+        if not ranges:
+            return True
+        headers = {'Range': 'bytes=' + ','.join(f'{s}-{e}' for s, e, _ in ranges)}
+        response = self.session.get(self.download_url, headers=headers, stream=True)
+        if response.status_code != 206 or \
+                'multipart/byteranges' not in response.headers.get('Content-Type', ''):
+            response.close()
+            return False
+
+        split_by_start = {s: i for s, _, i in ranges}
+        expected = sum(e - s + 1 for s, e, _ in ranges)
+        written = 0
+        reader = response.raw
+        reader.decode_content = False
+        buf = bytearray()
+        try:
+            while written < expected and not self.stop_event.is_set():
+                # Each part starts with boundary + headers, terminated by a
+                # blank line; the Content-Range header tells us where to write.
+                head_end = buf.find(b'\r\n\r\n')
+                while head_end < 0:
+                    chunk = reader.read(65536)
+                    if not chunk:
+                        return written >= expected
+                    buf.extend(chunk)
+                    head_end = buf.find(b'\r\n\r\n')
+                match = _CONTENT_RANGE.search(bytes(buf[:head_end]))
+                del buf[:head_end + 4]
+                if match is None:
+                    continue
+                part_start = int(match.group(1))
+                part_end = int(match.group(2))
+                split_index = split_by_start.get(part_start)
+                offset = part_start
+                remaining = part_end - part_start + 1
+                while remaining:
+                    if not buf:
+                        chunk = reader.read(65536)
+                        if not chunk:
+                            return False
+                        buf.extend(chunk)
+                    take = min(len(buf), remaining)
+                    os.pwrite(out_fd, memoryview(buf)[:take], offset)
+                    offset += take
+                    remaining -= take
+                    written += take
+                    if split_index is not None:
+                        self._progress_counts[split_index] += take
+                    del buf[:take]
+            return written >= expected
+        finally:
+            response.close()
+
+    def preallocate_output(self):
+        # Reserve the final file up front so every split writes straight to
+        # its own byte range; no .partN files and no merge pass afterwards.
+        fd = os.open(self.filename, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, self.total_size)
+            else:
+                os.ftruncate(fd, self.total_size)
+        except OSError:
+            os.ftruncate(fd, self.total_size)
+        return fd
+
+    def download(self):
+        if not self.ranges_supported:
+            self.num_splits = 1
         self.load_progress()
         self.start_time = time.time()
         split_size = self.total_size // self.num_splits
-        self.parts = [f"{self.filename}.part{i}" for i in range(self.num_splits)]
         self.split_sizes = [(i * split_size, (i + 1) * split_size - 1 if i < self.num_splits - 1 else self.total_size - 1) for i in range(self.num_splits)]
-        with ThreadPoolExecutor(max_workers=self.num_splits) as executor:
-            futures = []
-            for i, (start, end) in enumerate(self.split_sizes):
-                part_file = self.parts[i]
-                futures.append(executor.submit(self.download_split, start, end, part_file, i, progress_callback, status_callback, time_callback, speed_callback))
-            for future in as_completed(futures):
-                future.result()
+        flusher_done = threading.Event()
+        flusher = threading.Thread(target=self._progress_flusher, args=(flusher_done,), daemon=True)
+        flusher.start()
+        out_fd = self.preallocate_output()
+        try:
+            finished = False
+            if 0 < self.total_size < MULTIRANGE_THRESHOLD and self.num_splits > 1:
+                finished = self.download_multirange(out_fd)
+            if not finished and not self.stop_event.is_set():
+                with ThreadPoolExecutor(max_workers=self.num_splits) as executor:
+                    futures = []
+                    for i, (start, end) in enumerate(self.split_sizes):
+                        futures.append(executor.submit(self.download_split, out_fd, start, end, i))
+                    for future in as_completed(futures):
+                        future.result()
+        finally:
+            if hasattr(os, 'posix_fadvise'):
+                # The GUI never reads the file back; let the kernel evict
+                # its pages rather than crowding out other processes (best
+                # effort — dirty pages only drop once written back).
+                os.posix_fadvise(out_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            os.close(out_fd)
+            flusher_done.set()
+            flusher.join()
+            if self._progress_fd is not None:
+                os.close(self._progress_fd)
+                self._progress_fd = None
         if not self.stop_event.is_set():
-            self.merge_files()
-            if status_callback:
-                status_callback("Download Complete")
             if os.path.exists(self.progress_file):
                 os.remove(self.progress_file)
 
+    def close(self):
+        # Drop the pooled keep-alive connections; the session grows a new
+        # pool on the next request, so resuming afterwards still works.
+        self.session.close()
+
 class DownloaderGUI:
     def __init__(self, root):
         self.root = root
@@ -208,6 +416,8 @@ class DownloaderGUI:
         self.add_url_button.grid(row=1, column=2, padx=5, pady=5)
         self.del_url_button = tk.Button(root, text="Del URL", command=self.del_url)
         self.del_url_button.grid(row=1, column=3, padx=5, pady=5)
+        self.paste_urls_button = tk.Button(root, text="Paste URLs", command=self.paste_urls)
+        self.paste_urls_button.grid(row=1, column=4, padx=5, pady=5)
 
         self.url_listbox = tk.Listbox(root, height=5)
         self.url_listbox.grid(row=2, column=0, columnspan=4, padx=5, pady=5, sticky="nsew")
@@ -265,17 +475,28 @@ class DownloaderGUI:
 
         self.progress_bars = []
         self.progress_labels = []
+        self.progress_texts = []
+        self.progress_values = []
         self.downloader = None
         self.download_thread = None
         self.current_speed = 0  # Track current speed for display
+        self._download_active = False
+        self._download_error = None
+        self._sample_bytes = 0
+        self._sample_ts = None
+        self._meta_cache = {}  # url -> (download_url, filename, total_size, ranges_supported)
 
         self.update_mode()
+        # Single UI poller: the download threads never touch Tk widgets,
+        # they only bump counters that this 10 Hz tick reads.
+        self.root.after(100, self._tick)
 
     def update_mode(self):
         mode = self.mode_var.get()
         if mode == "single":
             self.add_url_button.config(state=tk.DISABLED)
             self.del_url_button.config(state=tk.DISABLED)
+            self.paste_urls_button.config(state=tk.DISABLED)
             self.url_listbox.config(state=tk.DISABLED)
             self.browse_button.config(state=tk.NORMAL)
             self.file_entry.config(state=tk.NORMAL)
@@ -285,6 +506,7 @@ class DownloaderGUI:
         elif mode == "multi":
             self.add_url_button.config(state=tk.NORMAL)
             self.del_url_button.config(state=tk.NORMAL)
+            self.paste_urls_button.config(state=tk.NORMAL)
             self.url_listbox.config(state=tk.NORMAL)
             self.browse_button.config(state=tk.DISABLED)
             self.file_entry.config(state=tk.DISABLED)
@@ -292,13 +514,27 @@ class DownloaderGUI:
             self.chunk_entry.config(state=tk.DISABLED)
             self.recommend_button.config(state=tk.DISABLED)
 
+    def add_urls(self, urls):
+        # One listbox insert for the whole batch: Tk repaints once instead
+        # of once per URL, which matters when pasting hundreds of them.
+        urls = [url for url in urls if url]
+        if urls:
+            self.url_queue.extend(urls)
+            self.url_listbox.insert(tk.END, *urls)
+
     def add_url(self):
         url = self.url_entry.get()
         if url:
-            self.url_queue.append(url)
-            self.url_listbox.insert(tk.END, url)
+            self.add_urls([url])
             self.url_entry.delete(0, tk.END)
 
+    def paste_urls(self):
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            return
+        self.add_urls([line.strip() for line in text.splitlines() if line.strip()])
+
     def del_url(self):
         selected = self.url_listbox.curselection()
         if selected:
@@ -306,34 +542,165 @@ class DownloaderGUI:
             del self.url_queue[index]
             self.url_listbox.delete(index)
 
+    def _get_downloader(self, url):
+        # Recommend -> Browse -> Download used to redo the HEAD probe (and
+        # for YouTube the full yt_dlp extraction) for each click; reuse the
+        # metadata from the first probe of this URL instead.
+        if self.downloader is not None and self.downloader.url == url:
+            # Same URL as the last click: keep the instance itself so a
+            # filename chosen via Browse survives into Download. A fresh
+            # instance would start with clean events, so reset any fired
+            # stop/pause left behind by a cancelled run.
+            self.downloader.stop_event.clear()
+            self.downloader.resume_event.set()
+            return self.downloader
+        downloader = Downloader(url)
+        cached = self._meta_cache.get(url)
+        if cached:
+            (downloader.download_url, downloader.filename,
+             downloader.total_size, downloader.ranges_supported) = cached
+            downloader.update_progress_file()
+        else:
+            downloader.get_download_info()
+            self._meta_cache[url] = (downloader.download_url, downloader.filename,
+                                     downloader.total_size, downloader.ranges_supported)
+        return downloader
+
+    def _probe_in_background(self, url, on_ready):
+        # The first probe of a URL blocks on a HEAD round trip (or a full
+        # yt_dlp extraction), which froze the window for seconds on slow
+        # servers. Run it on a worker thread and hop back to the main
+        # thread via root.after to touch any widgets.
+        self.status_label.config(text="Status: Fetching file info...")
+
+        def worker():
+            try:
+                downloader = self._get_downloader(url)
+            except Exception as exc:
+                def report(exc=exc):
+                    self.status_label.config(text="Status: Waiting")
+                    messagebox.showerror("Error", str(exc))
+                self.root.after(0, report)
+                return
+            def deliver():
+                self.downloader = downloader
+                self.status_label.config(text="Status: Waiting")
+                on_ready(downloader)
+            self.root.after(0, deliver)
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def browse_file(self):
         url = self.url_entry.get()
         if url:
-            self.downloader = Downloader(url)
-            self.downloader.get_download_info()
-            filename = self.downloader.filename
-            save_path = filedialog.asksaveasfilename(initialfile=filename)
-            if save_path:
-                save_path = os.path.join(os.getcwd(), os.path.basename(save_path))
-                self.downloader.filename = save_path  # Update the filename
-                self.downloader.update_progress_file()  # Update the progress file name
-                self.file_entry.delete(0, tk.END)
-                self.file_entry.insert(0, save_path)
+            self._probe_in_background(url, self._browse_ready)
+
+    def _browse_ready(self, downloader):
+        save_path = filedialog.asksaveasfilename(initialfile=downloader.filename)
+        if save_path:
+            save_path = os.path.join(os.getcwd(), os.path.basename(save_path))
+            downloader.filename = save_path  # Update the filename
+            downloader.update_progress_file()  # Update the progress file name
+            self.file_entry.delete(0, tk.END)
+            self.file_entry.insert(0, save_path)
 
     def recommend_download(self):
         url = self.url_entry.get()
         if url:
-            self.downloader = Downloader(url)
-            self.downloader.get_download_info()
-            self.downloader.determine_optimal_settings()
+            self._probe_in_background(url, self._recommend_ready)
+
+    def _recommend_ready(self, downloader):
+        downloader.determine_optimal_settings()
+        total_size = downloader.total_size
+        num_splits = downloader.num_splits
+        chunk_size = downloader.chunk_size // 1024  # Convert to KB
+        self.total_size_label.config(text=f"Total size: {downloader.filename} - {human_readable_size(total_size)}")
+        self.split_entry.delete(0, tk.END)
+        self.split_entry.insert(0, num_splits)
+        self.chunk_entry.delete(0, tk.END)
+        self.chunk_entry.insert(0, chunk_size)
+
+    def build_progress_rows(self, num_splits, total_size, initial=None):
+        self.clear_progress_bars()
+        part_size = total_size // num_splits if num_splits else 0
+        for i in range(num_splits):
+            downloaded = initial[i] if initial else 0
+            percentage = (downloaded / part_size) * 100 if part_size else 0
+            # Bind each row to Tk variables: setting a variable to its
+            # current value is a no-op at the widget layer, so unchanged
+            # rows cost nothing on each tick, unlike config(text=...).
+            text_var = tk.StringVar(value=f"Part {i + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)")
+            value_var = tk.IntVar(value=downloaded)
+            lbl = tk.Label(self.scroll_frame, textvariable=text_var, anchor="w")
+            lbl.grid(row=i, column=0, padx=5, pady=2, sticky="w")
+            pb = ttk.Progressbar(self.scroll_frame, orient="horizontal", length=400, mode="determinate", maximum=part_size, variable=value_var)
+            pb.grid(row=i, column=1, padx=5, pady=2, sticky="w")
+            self.progress_labels.append(lbl)
+            self.progress_bars.append(pb)
+            self.progress_texts.append(text_var)
+            self.progress_values.append(value_var)
+
+    def begin_download_thread(self, target):
+        self._sample_bytes = 0
+        self._sample_ts = None
+        self._download_error = None
+
+        def run():
+            # Record failures instead of letting the thread die silently;
+            # _tick checks this so a crashed download is never reported as
+            # complete.
+            try:
+                target()
+            except Exception as exc:
+                self._download_error = exc
+
+        self._download_active = True
+        self.download_thread = threading.Thread(target=run)
+        self.download_thread.start()
+
+    def _tick(self):
+        # Runs on the Tk main thread every 100 ms. The workers only bump
+        # per-split counters; all widget updates and string formatting
+        # happen here, so thousands of chunks collapse into 10 redraws/s.
+        if self._download_active and self.downloader is not None:
+            counts = self.downloader.progress_snapshot()
             total_size = self.downloader.total_size
-            num_splits = self.downloader.num_splits
-            chunk_size = self.downloader.chunk_size // 1024  # Convert to KB
-            self.total_size_label.config(text=f"Total size: {self.downloader.filename} - {human_readable_size(total_size)}")
-            self.split_entry.delete(0, tk.END)
-            self.split_entry.insert(0, num_splits)
-            self.chunk_entry.delete(0, tk.END)
-            self.chunk_entry.insert(0, chunk_size)
+            num_splits = len(counts)
+            part_size = total_size // num_splits if num_splits else 0
+            for i, downloaded in enumerate(counts):
+                if i >= len(self.progress_values):
+                    break
+                percentage = (downloaded / part_size) * 100 if part_size else 0
+                self.progress_values[i].set(downloaded)
+                self.progress_texts[i].set(f"Part {i + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)")
+
+            downloaded_total = sum(counts)
+            now = time.time()
+            if self._sample_ts is not None and now > self._sample_ts:
+                speed = (downloaded_total - self._sample_bytes) / (now - self._sample_ts)
+                self.current_speed = speed
+                self.speed_label.config(text=f"Speed: {human_readable_speed(speed)}")
+                if speed > 0 and total_size:
+                    remaining = (total_size - downloaded_total) / speed
+                    self.time_label.config(text=f"Estimated time remaining: {human_readable_time(remaining)}")
+                else:
+                    self.time_label.config(text="Estimated time remaining: Calculating...")
+            self._sample_bytes = downloaded_total
+            self._sample_ts = now
+
+            if self.download_thread is not None and not self.download_thread.is_alive():
+                self._download_active = False
+                if self.downloader.stop_event.is_set():
+                    self.status_label.config(text="Status: Download Cancelled")
+                elif self._download_error is not None:
+                    self.status_label.config(text=f"Status: Download Failed - {self._download_error}")
+                else:
+                    self.status_label.config(text="Status: Download Complete")
+                    self.clear_progress_bars()
+                    self.total_size_label.grid_remove()  # Hide total size label
+                    self.time_label.grid_remove()  # Hide estimated time remaining label
+                    self.speed_label.grid_remove()  # Hide speed label
+        self.root.after(100, self._tick)
 
     def start_download(self):
         if self.mode_var.get() == "single":
@@ -341,124 +708,60 @@ class DownloaderGUI:
             if not url:
                 messagebox.showerror("Error", "No URL provided.")
                 return
-            self.downloader = Downloader(url)
-            self.downloader.get_download_info()
             num_splits = int(self.split_entry.get())
             chunk_size = int(self.chunk_entry.get()) * 1024  # Convert to bytes
-            self.downloader.num_splits = num_splits
-            self.downloader.chunk_size = chunk_size
-            self.total_size_label.config(text=f"Total size: {self.downloader.filename} - {human_readable_size(self.downloader.total_size)}")
-
-            self.clear_progress_bars()
-            for i in range(num_splits):
-                part_size = self.downloader.total_size // num_splits
-                lbl = tk.Label(self.scroll_frame, text=f"Part {i + 1} - Size: {human_readable_size(part_size)}, Downloaded: 0 bytes (0.00%)", anchor="w")
-                lbl.grid(row=i, column=0, padx=5, pady=2, sticky="w")
-                pb = ttk.Progressbar(self.scroll_frame, orient="horizontal", length=400, mode="determinate", maximum=part_size)
-                pb.grid(row=i, column=1, padx=5, pady=2, sticky="w")
-                self.progress_labels.append(lbl)
-                self.progress_bars.append(pb)
-
-            def update_progress(split_index, chunk_size, part_size):
-                self.progress_bars[split_index]["value"] += chunk_size
-                downloaded = self.progress_bars[split_index]["value"]
-                percentage = (downloaded / part_size) * 100
-                self.progress_labels[split_index].config(text=f"Part {split_index + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)")
-                self.root.update_idletasks()
-
-            def update_status(message):
-                self.status_label.config(text=message)
-                self.root.update_idletasks()
-                if "Download Complete" in message:
-                    self.clear_progress_bars()
-                    self.total_size_label.grid_remove()  # Hide total size label
-                    self.time_label.grid_remove()  # Hide estimated time remaining label
-                    self.speed_label.grid_remove()  # Hide speed label
 
-            def update_time_remaining(remaining_time):
-                if remaining_time > 0:
-                    self.time_label.config(text=f"Estimated time remaining: {human_readable_time(remaining_time)}")
-                else:
-                    self.time_label.config(text="Estimated time remaining: Calculating...")
-                self.root.update_idletasks()
+            def start_single(downloader):
+                downloader.num_splits = num_splits
+                downloader.chunk_size = chunk_size
+                self.total_size_label.config(text=f"Total size: {downloader.filename} - {human_readable_size(downloader.total_size)}")
+                self.build_progress_rows(num_splits, downloader.total_size)
+                self.status_label.config(text="Status: Downloading...")
+                self.begin_download_thread(downloader.download)
 
-            def update_speed(speed):
-                self.current_speed = speed
-                self.speed_label.config(text=f"Speed: {human_readable_speed(speed)}")
-
-            self.status_label.config(text="Status: Downloading...")
-
-            def threaded_download():
-                self.downloader.download(progress_callback=update_progress, status_callback=update_status, time_callback=update_time_remaining, speed_callback=update_speed)
-
-            self.download_thread = threading.Thread(target=threaded_download)
-            self.download_thread.start()
+            self._probe_in_background(url, start_single)
 
         elif self.mode_var.get() == "multi":
             if len(self.url_queue) == 0:
                 messagebox.showerror("Error", "No URLs to download.")
                 return
 
+            def setup_current_download():
+                # Scheduled via root.after so the widgets are built on the
+                # main thread, never from the queue worker.
+                self.total_size_label.config(text=f"Total size: {self.downloader.filename} - {human_readable_size(self.downloader.total_size)}")
+                self.build_progress_rows(self.downloader.num_splits, self.downloader.total_size)
+                self.status_label.config(text="Status: Downloading...")
+
+            def report_failure(url, exc):
+                self.status_label.config(text=f"Status: Failed {os.path.basename(url)} - {exc}")
+
             def download_queue():
+                failed = 0
                 for url in self.url_queue:
-                    self.downloader = Downloader(url)
-                    self.downloader.get_download_info()
-                    self.downloader.determine_optimal_settings()
-                    num_splits = self.downloader.num_splits
-                    chunk_size = self.downloader.chunk_size // 1024  # Convert to KB
-                    total_size = self.downloader.total_size
-                    self.total_size_label.config(text=f"Total size: {self.downloader.filename} - {human_readable_size(total_size)}")
-                    self.clear_progress_bars()
-                    for i in range(num_splits):
-                        part_size = total_size // num_splits
-                        lbl = tk.Label(self.scroll_frame, text=f"Part {i + 1} - Size: {human_readable_size(part_size)}, Downloaded: 0 bytes (0.00%)", anchor="w")
-                        lbl.grid(row=i, column=0, padx=5, pady=2, sticky="w")
-                        pb = ttk.Progressbar(self.scroll_frame, orient="horizontal", length=400, mode="determinate", maximum=part_size)
-                        pb.grid(row=i, column=1, padx=5, pady=2, sticky="w")
-                        self.progress_labels.append(lbl)
-                        self.progress_bars.append(pb)
-
-                    def update_progress(split_index, chunk_size, part_size):
-                        self.progress_bars[split_index]["value"] += chunk_size
-                        downloaded = self.progress_bars[split_index]["value"]
-                        percentage = (downloaded / part_size) * 100
-                        self.progress_labels[split_index].config(text=f"Part {split_index + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)")
-                        self.root.update_idletasks()
-
-                    def update_status(message):
-                        self.status_label.config(text=message)
-                        self.root.update_idletasks()
-                        if "Download Complete" in message:
-                            for pb in self.progress_bars:
-                                pb["value"] = 0
-
-                    def update_time_remaining(remaining_time):
-                        if remaining_time > 0:
-                            self.time_label.config(text=f"Estimated time remaining: {human_readable_time(remaining_time)}")
-                        else:
-                            self.time_label.config(text="Estimated time remaining: Calculating...")
-                        self.root.update_idletasks()
-
-                    def update_speed(speed):
-                        self.current_speed = speed
-                        self.speed_label.config(text=f"Speed: {human_readable_speed(speed)}")
-
-                    self.status_label.config(text="Status: Downloading...")
-
-                    def threaded_download():
-                        self.downloader.download(progress_callback=update_progress, status_callback=update_status, time_callback=update_time_remaining, speed_callback=update_speed)
-
-                    self.download_thread = threading.Thread(target=threaded_download)
-                    self.download_thread.start()
-                    self.download_thread.join()  # Wait for the current download to complete
-
-                self.clear_progress_bars()  # Clear progress bars after all downloads are complete
-                self.total_size_label.grid_remove()  # Hide total size label
-                self.time_label.grid_remove()  # Hide estimated time remaining label
-                self.speed_label.grid_remove()  # Hide speed label
-
-            self.download_thread = threading.Thread(target=download_queue)
-            self.download_thread.start()
+                    # One bad URL must not abort the rest of the queue; the
+                    # old per-URL threads gave that isolation for free, so
+                    # keep it now that the downloads run inline here.
+                    try:
+                        self.downloader = Downloader(url)
+                        self.downloader.get_download_info()
+                        self.downloader.determine_optimal_settings()
+                        self._sample_bytes = 0
+                        self._sample_ts = None
+                        self.root.after(0, setup_current_download)
+                        # The queue already runs on its own worker thread, so
+                        # the downloads happen sequentially right here; no
+                        # point spawning a per-URL thread just to join it.
+                        self.downloader.download()
+                    except Exception as exc:
+                        failed += 1
+                        self.root.after(0, report_failure, url, exc)
+                if failed:
+                    # Propagate so the tick handler reports the queue as
+                    # failed instead of 'Download Complete'.
+                    raise RuntimeError(f"{failed} of {len(self.url_queue)} downloads failed")
+
+            self.begin_download_thread(download_queue)
 
     def clear_progress_bars(self):
         for pb in self.progress_bars:
@@ -467,71 +770,27 @@ class DownloaderGUI:
             lbl.destroy()
         self.progress_bars = []
         self.progress_labels = []
+        self.progress_texts = []
+        self.progress_values = []
 
     def cancel_download(self):
         if self.downloader:
             self.downloader.stop_event.set()
+            self.downloader.close()
             self.status_label.config(text="Status: Download Cancelled")
 
     def resume_download(self):
         if self.downloader:
             self.downloader.stop_event.clear()  # Clear the stop event to resume the download
-            self.downloader.pause_event.clear()  # Clear the pause event if it was set
+            self.downloader.resume_event.set()  # Release any paused workers
 
             total_size = self.downloader.total_size
             num_splits = self.downloader.num_splits
-            chunk_size = self.downloader.chunk_size // 1024  # Convert to KB
             self.total_size_label.config(text=f"Total size: {self.downloader.filename} - {human_readable_size(total_size)}")
-            for pb in self.progress_bars:
-                pb.destroy()
-            for lbl in self.progress_labels:
-                lbl.destroy()
-            self.progress_bars = []
-            self.progress_labels = []
-            for i in range(num_splits):
-                part_size = total_size // num_splits
-                downloaded = self.downloader.part_progress.get(str(i), 0)
-                percentage = (downloaded / part_size) * 100
-                lbl = tk.Label(self.scroll_frame, text=f"Part {i + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)", anchor="w")
-                lbl.grid(row=i, column=0, padx=5, pady=2, sticky="w")
-                pb = ttk.Progressbar(self.scroll_frame, orient="horizontal", length=400, mode="determinate", maximum=part_size)
-                pb["value"] = downloaded
-                pb.grid(row=i, column=1, padx=5, pady=2, sticky="w")
-                self.progress_labels.append(lbl)
-                self.progress_bars.append(pb)
-
-            def update_progress(split_index, chunk_size, part_size):
-                self.progress_bars[split_index]["value"] += chunk_size
-                downloaded = self.progress_bars[split_index]["value"]
-                percentage = (downloaded / part_size) * 100
-                self.progress_labels[split_index].config(text=f"Part {split_index + 1} - Size: {human_readable_size(part_size)}, Downloaded: {human_readable_size(downloaded)} ({percentage:.2f}%)")
-                self.root.update_idletasks()
-
-            def update_status(message):
-                self.status_label.config(text=message)
-                self.root.update_idletasks()
-                if "Download Complete" in message:
-                    for pb in self.progress_bars:
-                        pb["value"] = 0
-
-            def update_time_remaining(remaining_time):
-                if remaining_time > 0:
-                    self.time_label.config(text=f"Estimated time remaining: {human_readable_time(remaining_time)}")
-                else:
-                    self.time_label.config(text="Estimated time remaining: Calculating...")
-                self.root.update_idletasks()
-
-            def update_speed(speed):
-                self.current_speed = speed
-                self.speed_label.config(text=f"Speed: {human_readable_speed(speed)}")
-
+            self.build_progress_rows(num_splits, total_size,
+                                     initial=self.downloader.progress_snapshot())
             self.status_label.config(text="Status: Resuming...")
-
-            def threaded_resume_download():
-                self.downloader.download(progress_callback=update_progress, status_callback=update_status, time_callback=update_time_remaining, speed_callback=update_speed)
-
-            self.download_thread = threading.Thread(target=threaded_resume_download)
-            self.download_thread.start()
+            self.begin_download_thread(self.downloader.download)
 
     def clear_fields(self):
         self.url_entry.delete(0, tk.END)
@@ -545,6 +804,7 @@ class DownloaderGUI:
         self.clear_progress_bars()
         self.url_queue = []
         self.url_listbox.delete(0, tk.END)
+        self._meta_cache.clear()
         self.recommend_button.config(state=tk.NORMAL)
         self.split_entry.config(state=tk.NORMAL)
         self.chunk_entry.config(state=tk.NORMAL)